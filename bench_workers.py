@@ -0,0 +1,103 @@
+# bench_workers.py
+# Throughput comparison of 1 vs N uvicorn workers.
+#   python bench_workers.py --workers 4 --duration 10 --concurrency 32
+# Starts serve.py for each worker count, hammers GET /api/events and prints
+# requests/sec. Uses only the stdlib client so it runs wherever the backend does.
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+load_dotenv()
+API_KEY = os.getenv("API_KEY", "demo_api_key_please_change")
+
+
+def wait_ready(base, proc, timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline and proc.poll() is None:
+        try:
+            with urllib.request.urlopen(f"{base}/health", timeout=1) as r:
+                if r.status == 200:
+                    return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def hammer(url, duration, concurrency):
+    stop_at = time.time() + duration
+    counts = {"ok": 0, "err": 0}
+    lock = threading.Lock()
+
+    def worker():
+        ok = err = 0
+        req = urllib.request.Request(url, headers={"x-api-key": API_KEY})
+        while time.time() < stop_at:
+            try:
+                with urllib.request.urlopen(req, timeout=5) as r:
+                    r.read()
+                ok += 1
+            except OSError:
+                err += 1
+        with lock:
+            counts["ok"] += ok
+            counts["err"] += err
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    return counts
+
+
+def run(workers, port, duration, concurrency, path):
+    base = f"http://127.0.0.1:{port}"
+    # server output goes to a temp file (not a pipe nobody drains) so it can
+    # be shown if startup fails
+    log = tempfile.TemporaryFile()
+    proc = subprocess.Popen([sys.executable, "serve.py", "--workers", str(workers),
+                             "--port", str(port)],
+                            stdout=log, stderr=subprocess.STDOUT)
+    try:
+        if not wait_ready(base, proc):
+            proc.terminate()
+            proc.wait(timeout=60)
+            log.seek(0)
+            tail = log.read().decode(errors="replace")[-4000:]
+            raise RuntimeError(f"server with {workers} worker(s) did not start:\n{tail}")
+        counts = hammer(base + path, duration, concurrency)
+    finally:
+        if proc.poll() is None:
+            proc.terminate()
+            proc.wait(timeout=60)
+        log.close()
+    return counts["ok"] / duration, counts["err"]
+
+
+def main():
+    p = argparse.ArgumentParser(description="Compare 1 vs N worker throughput")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--port", type=int, default=3900)
+    p.add_argument("--duration", type=float, default=10.0)
+    p.add_argument("--concurrency", type=int, default=32)
+    p.add_argument("--path", default="/api/events?limit=50")
+    args = p.parse_args()
+
+    results = {}
+    for n in sorted({1, args.workers}):
+        rps, errors = run(n, args.port, args.duration, args.concurrency, args.path)
+        results[n] = rps
+        print(f"workers={n:<3} {rps:10.1f} req/s  errors={errors}")
+    if len(results) > 1 and results[1] > 0:
+        print(f"speedup x{results[args.workers] / results[1]:.2f} with {args.workers} workers")
+    elif len(results) > 1:
+        print("no speedup figure: the 1-worker run completed no requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# backend/coordination.py
+# Cross-process coordination for multi-worker serving: background jobs
+# (retention, notification dispatch, ...) must run on exactly one worker.
+import os
+import time
+import uuid
+import socket
+import sqlite3
+import logging
+import threading
+
+LOG = logging.getLogger("coordination")
+
+
+def enable_wal(conn, busy_timeout_ms=5000):
+    # WAL lets readers and the single writer proceed concurrently across worker
+    # processes; busy_timeout makes competing writers wait instead of failing
+    # immediately with "database is locked".
+    # synchronous is left at its FULL default: these rows are emergency events
+    # the API has already confirmed, so commits must survive power loss.
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)};")
+    return conn
+
+
+class FileLock:
+    """
+    Non-blocking exclusive lock on a file. The OS drops the lock when the
+    holding process exits, so a crashed worker never leaves it stuck.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._fh = None
+
+    def acquire(self):
+        if self._fh is not None:
+            return True
+        dirname = os.path.dirname(self.path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        fh = open(self.path, "a+")
+        try:
+            if os.name == "nt":
+                import msvcrt
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fh.close()
+            return False
+        fh.seek(0)
+        fh.truncate()
+        fh.write(str(os.getpid()))
+        fh.flush()
+        self._fh = fh
+        return True
+
+    # the lock is held until released or the process exits
+    renew = acquire
+
+    def release(self):
+        if self._fh is None:
+            return
+        try:
+            if os.name == "nt":
+                import msvcrt
+                self._fh.seek(0)
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._fh.close()
+            self._fh = None
+
+
+class DBLease:
+    """
+    Time-bounded lease stored in a SQLite table. The holder must renew before
+    `ttl` seconds pass; otherwise another worker may take the lease over.
+    """
+
+    def __init__(self, db_path, name, ttl=30.0, owner=None):
+        self.db_path = db_path
+        self.name = name
+        self.ttl = ttl
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+        enable_wal(conn)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+        """)
+        return conn
+
+    def acquire(self):
+        now = time.time()
+        conn = self._connect()
+        try:
+            # BEGIN IMMEDIATE takes the write lock up front so the
+            # check-then-write below is atomic across processes
+            conn.execute("BEGIN IMMEDIATE;")
+            row = conn.execute("SELECT owner, expires_at FROM leases WHERE name=?;",
+                               (self.name,)).fetchone()
+            if row and row[0] != self.owner and row[1] > now:
+                conn.execute("ROLLBACK;")
+                return False
+            conn.execute("INSERT OR REPLACE INTO leases (name, owner, expires_at) VALUES (?,?,?);",
+                         (self.name, self.owner, now + self.ttl))
+            conn.execute("COMMIT;")
+            return True
+        except sqlite3.OperationalError as err:
+            LOG.warning("lease %s acquire failed: %s", self.name, err)
+            return False
+        finally:
+            conn.close()
+
+    renew = acquire
+
+    def release(self):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM leases WHERE name=? AND owner=?;", (self.name, self.owner))
+        finally:
+            conn.close()
+
+
+class SingletonJob:
+    """
+    Runs `fn(lost)` every `interval` seconds on whichever worker holds `lock`.
+    The lock is polled/renewed every `poll` seconds, independently of the job
+    period, so a standby worker takes over within about `poll` seconds (file
+    lock) or the lease TTL (DB lease) of the holder dying.
+
+    `lost` is a threading.Event set if a renewal fails mid-run (e.g. the lease
+    lapsed and another worker took it); `fn` should check it and stop early.
+    A takeover can still overlap the tail of a run, so `fn` must be idempotent.
+    """
+
+    def __init__(self, name, fn, lock, interval=60.0, poll=None):
+        self.name = name
+        self.fn = fn
+        self.lock = lock
+        self.interval = interval
+        self.poll = poll if poll is not None else min(interval, 30.0)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name=f"job-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=10.0):
+        # the job thread releases the lock itself once `fn` has returned, so a
+        # run still in progress after `timeout` keeps the lock until it ends
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                LOG.warning("job %s still running at shutdown", self.name)
+            self._thread = None
+
+    def _run(self):
+        held = False
+        last_run = None
+        try:
+            while not self._stop.is_set():
+                try:
+                    ok = self.lock.renew() if held else self.lock.acquire()
+                except Exception:
+                    LOG.exception("job %s: lock error", self.name)
+                    ok = False
+                if ok and not held:
+                    LOG.info("job %s: running on pid %s", self.name, os.getpid())
+                elif held and not ok:
+                    LOG.warning("job %s: lost lock on pid %s", self.name, os.getpid())
+                held = ok
+                if held and (last_run is None or time.monotonic() - last_run >= self.interval):
+                    last_run = time.monotonic()
+                    if self._run_fn():
+                        held = False
+                self._stop.wait(self.poll)
+        finally:
+            try:
+                self.lock.release()
+            except Exception:
+                LOG.exception("job %s: lock release failed", self.name)
+
+    def _run_fn(self):
+        # keep renewing while `fn` runs so a long run doesn't let the lease
+        # lapse; returns True if the lock was lost during the run
+        done = threading.Event()
+        lost = threading.Event()
+
+        def heartbeat():
+            while not done.wait(self.poll) and not lost.is_set():
+                try:
+                    ok = self.lock.renew()
+                except Exception:
+                    LOG.exception("job %s: lock renew failed", self.name)
+                    ok = False
+                if not ok:
+                    LOG.warning("job %s: lost lock on pid %s while running", self.name, os.getpid())
+                    lost.set()
+
+        hb = threading.Thread(target=heartbeat, name=f"job-{self.name}-hb", daemon=True)
+        hb.start()
+        try:
+            self.fn(lost)
+        except Exception:
+            LOG.exception("job %s failed", self.name)
+        finally:
+            done.set()
+            hb.join()
+        return lost.is_set()
@@ -0,0 +1,61 @@
+# backend/event_models.py
+from sqlalchemy import (
+    Column, Integer, String, Float, DateTime, JSON, create_engine, func, event
+)
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.sql import text
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./events.db")
+
+Base = declarative_base()
+
+class Event(Base):
+    __tablename__ = "events"
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(String, default="unknown")
+    type = Column(String, default="unknown")
+    confidence = Column(Float, default=0.0)
+    # store as "lat,lon" string for simplicity, or JSON with {"lat":..., "lon":...}
+    lat = Column(Float, nullable=True)
+    lon = Column(Float, nullable=True)
+    audio_key = Column(String, nullable=True)
+    video_key = Column(String, nullable=True)
+    speed = Column(Float, nullable=True)
+    accel_peak = Column(Float, nullable=True)
+    # "metadata" is reserved on declarative classes; keep the column name
+    meta = Column("metadata", JSON, default={})
+    status = Column(String, default="sent")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+def create_db_engine():
+    engine = create_engine(DATABASE_URL, echo=False, future=True)
+    if engine.dialect.name == "sqlite":
+        # every uvicorn worker opens its own connections to the same file;
+        # WAL + busy_timeout keeps them from failing with "database is locked"
+        from coordination import enable_wal
+
+        @event.listens_for(engine, "connect")
+        def _sqlite_wal(dbapi_conn, _record):
+            enable_wal(dbapi_conn)
+    return engine
+
+# helper session factory
+engine = create_db_engine()
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+def init_db():
+    # Using SQLAlchemy engine to create tables. Runs on app startup in every
+    # worker (serve.py also runs it once up front); workers racing on the DDL
+    # can hit "already exists", after which a second checkfirst pass is a no-op.
+    try:
+        Base.metadata.create_all(bind=engine)
+    except OperationalError as err:
+        if "already exists" not in str(err):
+            raise
+        Base.metadata.create_all(bind=engine)
+    return engine
@@ -1,14 +1,15 @@
 # backend/main.py
 import os
-from fastapi import FastAPI, HTTPException, Request, UploadFile, File
+from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Depends
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-from models import SessionLocal, Event, init_db
+from event_models import SessionLocal, Event, init_db
 from services import presign_upload, save_local_file, get_local_file_url, send_sms, call_number
+from coordination import FileLock, DBLease, SingletonJob
 from pydantic import BaseModel
 from typing import Optional, List, Dict
-import uvicorn
+from datetime import datetime, timedelta, timezone
 import logging
 
 load_dotenv()
@@ -16,9 +17,18 @@ LOG = logging.getLogger("backend")
 logging.basicConfig(level=logging.INFO)
 
 API_KEY = os.getenv("API_KEY", "demo_api_key_please_change")
-HOST = "127.0.0.1"
+HOST = os.getenv("HOST", "127.0.0.1")
 PORT = int(os.getenv("PORT", 3000))
 
+# background jobs run on a single worker; set JOB_LEASE_DB to coordinate via a
+# SQLite lease table instead of a lock file
+JOB_LOCK_FILE = os.getenv("JOB_LOCK_FILE", "./backend/jobs.lock")
+JOB_LEASE_DB = os.getenv("JOB_LEASE_DB", "")
+RETENTION_DAYS = float(os.getenv("RETENTION_DAYS") or 0)
+RETENTION_INTERVAL = float(os.getenv("RETENTION_INTERVAL") or 3600)
+# how often standby workers retry the job lock (and the holder renews it)
+JOB_LOCK_POLL = float(os.getenv("JOB_LOCK_POLL") or 30)
+
 app = FastAPI()
 app.add_middleware(
     CORSMiddleware,
@@ -41,6 +51,56 @@ async def check_api_key(request: Request, call_next):
     return await call_next(request)
 
 
+def purge_old_events(lost=None):
+    cutoff = datetime.now(timezone.utc) - timedelta(days=RETENTION_DAYS)
+    db = SessionLocal()
+    try:
+        n = db.query(Event).filter(Event.created_at < cutoff).delete(synchronize_session=False)
+        if lost is not None and lost.is_set():
+            # another worker owns the job now; leave the purge to it
+            db.rollback()
+            return
+        db.commit()
+    finally:
+        db.close()
+    if n:
+        LOG.info("retention: purged %d events older than %s", n, cutoff.isoformat())
+
+def job_lock(name, poll):
+    if JOB_LEASE_DB:
+        return DBLease(JOB_LEASE_DB, name, ttl=poll * 3)
+    root, ext = os.path.splitext(JOB_LOCK_FILE)
+    return FileLock(f"{root}.{name}{ext}")
+
+# one session per request, always closed: leaked sessions hold pooled
+# connections until GC and stall every worker once the pool is exhausted
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+JOBS = []
+
+@app.on_event("startup")
+def start_jobs():
+    # create tables however the app is launched (uvicorn main:app, serve.py, ...)
+    init_db()
+    if RETENTION_DAYS > 0:
+        poll = min(RETENTION_INTERVAL, JOB_LOCK_POLL)
+        JOBS.append(SingletonJob("retention", purge_old_events,
+                                 job_lock("retention", poll), RETENTION_INTERVAL, poll=poll))
+    for job in JOBS:
+        job.start()
+
+@app.on_event("shutdown")
+def stop_jobs():
+    for job in JOBS:
+        job.stop()
+    JOBS.clear()
+
+
 @app.get("/")
 def root():
     return {"status": "backend ok"}
@@ -96,8 +156,7 @@ class EventIn(BaseModel):
 
 # Create event
 @app.post("/api/events")
-def create_event(e: EventIn):
-    db = SessionLocal()
+def create_event(e: EventIn, db=Depends(get_db)):
     ev = Event(
         user_id=e.userId,
         type=e.type,
@@ -108,7 +167,7 @@ def create_event(e: EventIn):
         video_key=e.videoKey,
         speed=e.speed,
         accel_peak=e.accelPeak,
-        metadata=e.metadata
+        meta=e.metadata
     )
     db.add(ev)
     db.commit()
@@ -137,8 +196,7 @@ def create_event(e: EventIn):
 
 # Get events (latest first)
 @app.get("/api/events")
-def get_events(limit: int = 50):
-    db = SessionLocal()
+def get_events(limit: int = 50, db=Depends(get_db)):
     rows = db.query(Event).order_by(Event.created_at.desc()).limit(limit).all()
     out = []
     for r in rows:
@@ -153,7 +211,7 @@ def get_events(limit: int = 50):
             "videoKey": r.video_key,
             "speed": r.speed,
             "accelPeak": r.accel_peak,
-            "metadata": r.metadata,
+            "metadata": r.meta,
             "status": r.status,
             "createdAt": r.created_at.isoformat()
         })
@@ -161,8 +219,7 @@ def get_events(limit: int = 50):
 
 # Acknowledge/update event
 @app.put("/api/events/{event_id}/ack")
-def ack_event(event_id: int, payload: dict):
-    db = SessionLocal()
+def ack_event(event_id: int, payload: dict, db=Depends(get_db)):
     ev = db.query(Event).get(event_id)
     if not ev:
         raise HTTPException(status_code=404, detail="not found")
@@ -172,13 +229,12 @@ def ack_event(event_id: int, payload: dict):
 
 # Force notify (manual)
 @app.post("/api/notify/{event_id}")
-def notify_event(event_id: int):
-    db = SessionLocal()
+def notify_event(event_id: int, db=Depends(get_db)):
     ev = db.query(Event).get(event_id)
     if not ev:
         raise HTTPException(status_code=404, detail="not found")
     # simple notify: use metadata.trustedContacts if present
-    contacts = (ev.metadata or {}).get("trustedContacts", [])
+    contacts = (ev.meta or {}).get("trustedContacts", [])
     results = []
     for c in contacts:
         phone = c.get("phone") if isinstance(c, dict) else c
@@ -192,6 +248,6 @@ def notify_event(event_id: int):
     return {"ok": True, "results": results}
 
 if __name__ == "__main__":
-    # ensure DB exists
-    init_db()
-    uvicorn.run("backend.main:app", host=HOST, port=PORT, reload=True)
+    # serve.py creates the tables, then starts the workers
+    from serve import main
+    main()
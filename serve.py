@@ -0,0 +1,58 @@
+# backend/serve.py
+# Production entry point: N uvicorn workers with graceful shutdown.
+#   python serve.py --workers 4 --host 0.0.0.0 --port 3000
+import os
+import argparse
+import logging
+import uvicorn
+from dotenv import load_dotenv
+
+load_dotenv()
+LOG = logging.getLogger("serve")
+
+
+def default_workers():
+    return int(os.getenv("WORKERS") or os.cpu_count() or 1)
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Run the safety reflex backend")
+    p.add_argument("--host", default=os.getenv("HOST", "127.0.0.1"))
+    p.add_argument("--port", type=int, default=int(os.getenv("PORT", 3000)))
+    p.add_argument("--workers", type=int, default=default_workers(),
+                   help="worker processes (default: $WORKERS or CPU count)")
+    p.add_argument("--graceful-timeout", type=int,
+                   default=int(os.getenv("GRACEFUL_TIMEOUT") or 30),
+                   help="seconds to let in-flight requests finish on SIGTERM/SIGINT")
+    p.add_argument("--reload", action="store_true",
+                   help="development auto-reload (forces a single worker)")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workers = max(1, args.workers)
+    if args.reload and workers > 1:
+        LOG.warning("--reload ignores --workers=%d; running one worker", workers)
+        workers = 1
+    # main.py builds upload URLs from HOST/PORT; spawned workers inherit the
+    # environment, so make it match what uvicorn actually binds
+    os.environ["HOST"] = args.host
+    os.environ["PORT"] = str(args.port)
+    # each worker also creates tables on startup; doing it once here first
+    # just spares them the DDL race
+    from event_models import init_db
+    init_db()
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=None if args.reload else workers,
+        reload=args.reload,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
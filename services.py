@@ -76,11 +76,16 @@ def init_twilio_client():
         return Client(TWILIO_SID, TWILIO_AUTH_TOKEN)
     return None
 
+# cached per process. uvicorn spawns its workers, so each already builds its
+# own client; the pid check covers fork-based servers (e.g. gunicorn --preload)
+# where a client created in the parent would otherwise leak into the children
 _twilio_client = None
+_twilio_pid = None
 def twilio_client():
-    global _twilio_client
-    if _twilio_client is None:
+    global _twilio_client, _twilio_pid
+    if _twilio_client is None or _twilio_pid != os.getpid():
         _twilio_client = init_twilio_client()
+        _twilio_pid = os.getpid()
     return _twilio_client
 
 def send_sms(to, body):
@@ -0,0 +1,91 @@
+# test_coordination.py
+import time
+import sqlite3
+import importlib
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from coordination import FileLock, DBLease, SingletonJob
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    path = str(tmp_path / "jobs.lock")
+    a, b = FileLock(path), FileLock(path)
+    assert a.acquire()
+    assert not b.acquire()
+    a.release()
+    assert b.acquire()
+    b.release()
+
+
+def test_db_lease_taken_over_after_ttl(tmp_path):
+    db = str(tmp_path / "leases.db")
+    a = DBLease(db, "retention", ttl=0.2)
+    b = DBLease(db, "retention", ttl=0.2)
+    assert a.acquire()
+    assert not b.acquire()
+    assert a.renew()
+    time.sleep(0.3)
+    assert b.acquire()
+    assert not a.renew()
+
+
+def test_db_lease_release_keeps_other_owner(tmp_path):
+    db = str(tmp_path / "leases.db")
+    a = DBLease(db, "retention", ttl=0.1)
+    b = DBLease(db, "retention", ttl=30)
+    assert a.acquire()
+    time.sleep(0.2)
+    assert b.acquire()
+    a.release()
+    owners = sqlite3.connect(db).execute("SELECT owner FROM leases;").fetchall()
+    assert owners == [(b.owner,)]
+
+
+def test_singleton_job_signals_lost_lease(tmp_path):
+    db = str(tmp_path / "leases.db")
+    holder = DBLease(db, "retention", ttl=0.2)
+    thief = DBLease(db, "retention", ttl=30)
+    seen = []
+
+    def fn(lost):
+        # stall past the lease TTL so another worker can take over
+        time.sleep(0.55)
+        seen.append(thief.acquire())
+        seen.append(lost.wait(1.0))
+
+    job = SingletonJob("retention", fn, holder, interval=60, poll=0.3)
+    job.start()
+    time.sleep(2.0)
+    job.stop()
+    assert seen == [True, True]
+
+
+def test_purge_old_events_deletes_only_before_cutoff(tmp_path, monkeypatch):
+    pytest.importorskip("fastapi")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'events.db'}")
+    monkeypatch.setenv("UPLOAD_FOLDER", str(tmp_path / "uploads"))
+    import event_models
+    import main
+    importlib.reload(event_models)
+    importlib.reload(main)
+    event_models.init_db()
+    monkeypatch.setattr(main, "RETENTION_DAYS", 7)
+
+    now = datetime.now(timezone.utc)
+    db = main.SessionLocal()
+    db.add_all([
+        main.Event(type="old", created_at=now - timedelta(days=8)),
+        main.Event(type="recent", created_at=now - timedelta(days=6)),
+        main.Event(type="new", created_at=now),
+    ])
+    db.commit()
+    db.close()
+
+    main.purge_old_events()
+
+    db = main.SessionLocal()
+    assert sorted(e.type for e in db.query(main.Event).all()) == ["new", "recent"]
+    db.close()